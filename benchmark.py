@@ -0,0 +1,331 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+import mplfinance as mpf
+
+from bitp import positions_to_hex
+from candle_mplfin import generate_sample_data
+from tic import (
+    DASHBOARD_INDICATORS,
+    INDICATORS,
+    build_dashboard_figure,
+    compute_indicators,
+    compute_indicators_chunked,
+    shared_indicators,
+    write_html_binary
+)
+
+DEFAULT_SIZES = (1_000, 100_000, 10_000_000)
+DEFAULT_SYMBOLS = (1, 10, 100, 1_000)
+
+# Stages that cannot run at every size are capped rather than attempted:
+# generate_sample_data loops in Python over a daily date_range (which overflows
+# past ~87k days), plotly/mplfinance output grows with every bar drawn and the
+# chunked path writes every indicator value to CSV.
+STAGE_MAX_BARS = {
+    'generate_sample_data': 10_000,
+    'figure': 100_000,
+    'write_html': 100_000,
+    'write_html_binary': 100_000,
+    'mpf_plot': 10_000,
+    'bitmask': 100_000,
+    'chunked': 1_000_000
+}
+CHUNK_BARS = 100_000
+
+# A stage regresses when it is this much slower than the baseline, and the
+# absolute slowdown exceeds timer noise
+DEFAULT_TOLERANCE = 0.25
+NOISE_SECONDS = 0.005
+
+def synthetic_ohlcv(bars, seed=42):
+    """
+    Vectorised random-walk OHLCV data on a minute index (offline, reproducible).
+    Returns are minute-scale so prices stay finite over 1e7 bars.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.0005, bars)
+    close = 100 * np.cumprod(1 + returns)
+    open_ = np.concatenate(([100.0], close[:-1]))
+    intraday_range = np.abs(rng.normal(0, 0.0005, bars))
+
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + intraday_range),
+        'Low': np.minimum(open_, close) * (1 - intraday_range),
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, bars)
+    }, index=pd.date_range(start='2000-01-01', periods=bars, freq='min'))
+
+def time_call(func, repeat):
+    """
+    Return the best wall time of `repeat` calls to func
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bar_stages(df, workdir):
+    """
+    Map stage name -> setup function returning the callable to time.
+    Setup (building the figure, random masks) is kept out of the timing and
+    only runs for stages that are not skipped.
+    """
+    bars = len(df)
+
+    def html_stage(write):
+        fig = build_dashboard_figure(df.copy())
+        return lambda: write(fig)
+
+    def bitmask_stage():
+        rng = np.random.default_rng(0)
+        masks = [rng.integers(0, 128, 16).tolist() for _ in range(bars)]
+        return lambda: [positions_to_hex(mask) for mask in masks]
+
+    stages = {
+        'generate_sample_data': lambda: lambda: generate_sample_data(bars),
+        'figure': lambda: lambda: build_dashboard_figure(df.copy()),
+        'write_html': lambda: html_stage(
+            lambda fig: fig.write_html(os.path.join(workdir, 'bench.html'))),
+        'write_html_binary': lambda: html_stage(
+            lambda fig: write_html_binary(fig, os.path.join(workdir, 'bench_binary.html'))),
+        'mpf_plot': lambda: lambda: mpf.plot(df, type='candle', style='charles', volume=True,
+                                             warn_too_much_data=bars + 1,
+                                             savefig=os.path.join(workdir, 'bench.png'), closefig=True),
+        'bitmask': bitmask_stage,
+        'chunked': lambda: lambda: compute_indicators_chunked(
+            (df.iloc[i:i + CHUNK_BARS] for i in range(0, bars, CHUNK_BARS)),
+            DASHBOARD_INDICATORS, os.path.join(workdir, 'bench_chunked.csv'))
+    }
+    for name in INDICATORS:
+        stages[f'indicator:{name}'] = lambda name=name: lambda: compute_indicators(df.copy(), [name])
+
+    return stages
+
+def run_benchmarks(sizes, symbols, symbol_bars, repeat, stages=None, workers=None):
+    """
+    Run every stage at every size, then the symbol universe sweep (serial and
+    across `workers` processes over shared memory).
+    Returns a list of result records.
+    """
+    results = []
+
+    def wanted(stage):
+        return stages is None or any(stage == s or stage.startswith(f'{s}:') for s in stages)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for bars in sizes:
+            df = synthetic_ohlcv(bars)
+
+            for stage, setup in bar_stages(df, workdir).items():
+                if not wanted(stage):
+                    continue
+
+                record = {'stage': stage, 'bars': bars, 'symbols': 1}
+                if bars > STAGE_MAX_BARS.get(stage, bars):
+                    record.update(status='skipped', reason=f'above {STAGE_MAX_BARS[stage]:,} bars')
+                else:
+                    record.update(status='ok', seconds=time_call(setup(), repeat))
+
+                results.append(record)
+                print(format_record(record))
+
+        # universe: compute_indicators per DataFrame. universe_shared: the same
+        # kernels over shared arrays; workers=1 runs in-process and is the
+        # serial baseline for the speedup
+        for count in symbols if wanted('universe') or wanted('universe_shared') else ():
+            universe = {f'SYM{seed}': synthetic_ohlcv(symbol_bars, seed=seed) for seed in range(count)}
+            record = {'bars': symbol_bars, 'symbols': count, 'status': 'ok'}
+
+            if wanted('universe'):
+                def compute_serial():
+                    for df in universe.values():
+                        compute_indicators(df.copy(), DASHBOARD_INDICATORS)
+
+                results.append(dict(record, stage='universe', seconds=time_call(compute_serial, repeat)))
+                print(format_record(results[-1]))
+
+            if wanted('universe_shared'):
+                serial = None
+                for count_workers in sorted(set([1] + list(workers or [1]))):
+                    def compute_shared():
+                        with shared_indicators(universe, DASHBOARD_INDICATORS, count_workers):
+                            pass
+
+                    seconds = time_call(compute_shared, repeat)
+                    serial = serial or seconds
+                    results.append(dict(record, stage='universe_shared', workers=count_workers,
+                                        seconds=seconds, speedup=serial / seconds))
+                    print(format_record(results[-1]))
+
+    return results
+
+def format_record(record):
+    label = f"{record['stage']:<28} bars={record['bars']:>12,} symbols={record['symbols']:>5,}"
+    if record['status'] != 'ok':
+        return f"{label}  {record['status']} ({record['reason']})"
+    line = f"{label}  {record['seconds'] * 1000:12.2f} ms"
+    if 'workers' in record:
+        line += f"  workers={record['workers']:<3} speedup={record['speedup']:.2f}x"
+    return line
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results with a baseline run; return the records that got slower
+    """
+    previous = {
+        (r['stage'], r['bars'], r['symbols'], r.get('workers')): r['seconds']
+        for r in baseline['results'] if r['status'] == 'ok'
+    }
+    regressions = []
+
+    for record in results:
+        key = (record['stage'], record['bars'], record['symbols'], record.get('workers'))
+        if record['status'] != 'ok' or key not in previous:
+            continue
+
+        before, after = previous[key], record['seconds']
+        if after > before * (1 + tolerance) and after - before > NOISE_SECONDS:
+            regressions.append(dict(record, baseline_seconds=before, ratio=after / before))
+
+    return regressions
+
+def gapped_ohlcv(bars, seed=42):
+    """
+    synthetic_ohlcv with NaN gaps in Close: single bars, a run longer than
+    an EWM block and a run at the very start
+    """
+    df = synthetic_ohlcv(bars, seed)
+    close = df.columns.get_loc('Close')
+    for start, stop in ((0, 3), (100, 101), (400, 480), (bars - 10, bars - 9)):
+        df.iloc[start:stop, close] = np.nan
+    return df
+
+def verify(bars=1_500, chunk_sizes=(1, 63, 64, 65, None)):
+    """
+    Check the properties the indicator paths promise and return the failures:
+    chunked output and shared-memory results are bit-identical to
+    compute_indicators, and the registry kernels stay close to the pandas
+    formulas they replace.
+    """
+    failures = []
+    names = list(INDICATORS)
+    df = gapped_ohlcv(bars)
+    expected = df.copy()
+    compute_indicators(expected, names)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'verify.csv')
+        for size in chunk_sizes:
+            size = size or bars
+            compute_indicators_chunked((df.iloc[i:i + size] for i in range(0, bars, size)), names, path)
+            chunked = pd.read_csv(path, index_col=0, float_precision='round_trip')
+            for column in chunked.columns:
+                if not np.array_equal(chunked[column].to_numpy(), expected[column].to_numpy(), equal_nan=True):
+                    failures.append(f"chunked (chunk={size}) differs from in-memory: {column}")
+
+    universe = {f'SYM{seed}': gapped_ohlcv(bars, seed) for seed in range(4)}
+    universe['SHORT'] = synthetic_ohlcv(30)
+    with shared_indicators(universe, names, workers=2) as shared:
+        for symbol, symbol_df in universe.items():
+            symbol_expected = symbol_df.copy()
+            compute_indicators(symbol_expected, names)
+            for column, values in shared[symbol].items():
+                if column in symbol_expected:
+                    want = symbol_expected[column].to_numpy()
+                else:
+                    want = np.full(len(symbol_df), np.nan)
+                if not np.array_equal(values, want, equal_nan=True):
+                    failures.append(f"shared-memory result differs from in-memory: {symbol} {column}")
+
+    close = df['Close']
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+    reference = {
+        'MA20': close.rolling(window=20).mean(),
+        'MA200': close.rolling(window=200).mean(),
+        'BB_Std': close.rolling(window=20).std(),
+        'RSI': 100 - (100 / (1 + gain / loss)),
+        'MACD': macd,
+        'MACD_Signal': macd.ewm(span=9).mean()
+    }
+    for column, values in reference.items():
+        if not np.allclose(expected[column], values, rtol=1e-6, atol=1e-9, equal_nan=True):
+            failures.append(f"{column} is not close to the pandas formula")
+
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data generation, indicators, charts and export")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="bar counts to benchmark")
+    parser.add_argument('--symbols', type=int, nargs='+', default=DEFAULT_SYMBOLS, help="universe sizes to benchmark")
+    parser.add_argument('--symbol-bars', type=int, default=1_000, help="bars per symbol in the universe sweep")
+    parser.add_argument('--stages', nargs='+', help="only run these stages (e.g. indicator figure universe)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                        help="process counts for the shared-memory universe stage (1 is always run)")
+    parser.add_argument('--repeat', type=int, default=3, help="calls per stage, best time is kept")
+    parser.add_argument('--output', default='benchmark_results.json', help="where to save the results")
+    parser.add_argument('--baseline', help="previous results JSON to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown ratio")
+    parser.add_argument('--verify', action='store_true', help="check indicator correctness instead of timing")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        failures = verify()
+        for failure in failures:
+            print(f"✗ {failure}")
+        if failures:
+            return 1
+        print("✓ Indicator checks passed")
+        return 0
+
+    results = run_benchmarks(args.sizes, args.symbols, args.symbol_bars, args.repeat, args.stages, args.workers)
+
+    report = {
+        'meta': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'cpus': os.cpu_count(),
+            'workers': args.workers,
+            'repeat': args.repeat,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) against {args.baseline}:")
+            for record in regressions:
+                print(f"  {format_record(record)}  ({record['ratio']:.2f}x baseline)")
+            return 1
+        print(f"\n✓ No regressions against {args.baseline}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,16 @@
+def positions_to_hex(positions):
+    """
+    Convert bit positions (0-127) to a 32-digit (128-bit) hex string
+    """
+    if any(pos < 0 or pos > 127 for pos in positions):
+        raise ValueError("All positions must be between 0 and 127")
+    
+    # Calculate result
+    result = sum(1 << pos for pos in positions)
+    
+    # Convert to 32-digit hex (128 bits)
+    return f"{result:032X}"
+
 def simple_positions_to_hex():
     """
     Simple version: converts bit positions to 128-bit hex value
@@ -10,16 +23,12 @@ def simple_positions_to_hex():
         positions = list(map(int, positions_str.split()))
     
     # Validate positions
-    if any(pos < 0 or pos > 127 for pos in positions):
-        print("Error: All positions must be between 0 and 127")
+    try:
+        hex_result = positions_to_hex(positions)
+    except ValueError as e:
+        print(f"Error: {e}")
         return
     
-    # Calculate result
-    result = sum(1 << pos for pos in positions)
-    
-    # Convert to 32-digit hex (128 bits)
-    hex_result = f"{result:032X}"
-    
     print(f"Hex result: 0x{hex_result}")
 
 if __name__ == "__main__":
@@ -50,12 +50,13 @@ def generate_sample_data(days=100):
     
     return df
 
-# Generate data
-df = generate_sample_data(60)
+if __name__ == "__main__":
+    # Generate data
+    df = generate_sample_data(60)
 
-# Basic candlestick plot
-mpf.plot(df, type='candle', style='charles', 
-         title='Basic Candlestick Chart',
-         ylabel='Price ($)',
-         volume=True,
-         figsize=(12, 8))
+    # Basic candlestick plot
+    mpf.plot(df, type='candle', style='charles', 
+             title='Basic Candlestick Chart',
+             ylabel='Price ($)',
+             volume=True,
+             figsize=(12, 8))
@@ -46,25 +46,26 @@ def generate_sample_data(days=100):
     
     return df
 
-# Generate data
-df = generate_sample_data(100)
+if __name__ == "__main__":
+    # Generate data
+    df = generate_sample_data(100)
 
-# Calculate moving averages
-df['MA20'] = df['Close'].rolling(window=20).mean()
-df['MA50'] = df['Close'].rolling(window=50).mean()
+    # Calculate moving averages
+    df['MA20'] = df['Close'].rolling(window=20).mean()
+    df['MA50'] = df['Close'].rolling(window=50).mean()
 
-# Create additional plots for moving averages
-apds = [
-    mpf.make_addplot(df['MA20'], color='blue', width=1.5),
-    mpf.make_addplot(df['MA50'], color='red', width=1.5)
-]
+    # Create additional plots for moving averages
+    apds = [
+        mpf.make_addplot(df['MA20'], color='blue', width=1.5),
+        mpf.make_addplot(df['MA50'], color='red', width=1.5)
+    ]
 
-# Advanced candlestick plot with moving averages
-mpf.plot(df, type='candle', 
-         addplot=apds,
-         style='yahoo',
-         title='Candlestick Chart with Moving Averages',
-         ylabel='Price ($)',
-         volume=True,
-         figsize=(14, 10),
-         savefig='candlestick_chart.png')
+    # Advanced candlestick plot with moving averages
+    mpf.plot(df, type='candle', 
+             addplot=apds,
+             style='yahoo',
+             title='Candlestick Chart with Moving Averages',
+             ylabel='Price ($)',
+             volume=True,
+             figsize=(14, 10),
+             savefig='candlestick_chart.png')
@@ -45,55 +45,56 @@ def generate_sample_data(days=100):
     }, index=dates)
     
     return df
-# Generate data
-df = generate_sample_data(80)
-# Create subplots with secondary y-axis
-fig = make_subplots(
-    rows=2, cols=1,
-    shared_xaxes=True,
-    vertical_spacing=0.1,
-    subplot_titles=('Stock Price', 'Volume'),
-    row_width=[0.2, 0.7]
-)
-# Add candlestick chart
-fig.add_trace(
-    go.Candlestick(
-        x=df.index,
-        open=df['Open'],
-        high=df['High'],
-        low=df['Low'],
-        close=df['Close'],
-        name='OHLC',
-        increasing_line_color='green',
-        decreasing_line_color='red'
-    ),
-    row=1, col=1
-)
-# Add volume bar chart
-fig.add_trace(
-    go.Bar(
-        x=df.index,
-        y=df['Volume'],
-        name='Volume',
-        marker_color='lightblue',
-        opacity=0.7
-    ),
-    row=2, col=1
-)
-# Update layout
-fig.update_layout(
-    title='Interactive Candlestick Chart with Volume',
-    yaxis_title='Price ($)',
-    xaxis_rangeslider_visible=False,
-    height=800,
-    showlegend=True
-)
-fig.update_yaxes(title_text="Price ($)", row=1, col=1)
-fig.update_yaxes(title_text="Volume", row=2, col=1)
-# Show the plot (comment out if causing issues)
-# fig.show()
 
-# Save as HTML file
-fig.write_html("interactive_candlestick.html")
-print("Chart saved to interactive_candlestick.html")
+if __name__ == "__main__":
+    # Generate data
+    df = generate_sample_data(80)
+    # Create subplots with secondary y-axis
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.1,
+        subplot_titles=('Stock Price', 'Volume'),
+        row_width=[0.2, 0.7]
+    )
+    # Add candlestick chart
+    fig.add_trace(
+        go.Candlestick(
+            x=df.index,
+            open=df['Open'],
+            high=df['High'],
+            low=df['Low'],
+            close=df['Close'],
+            name='OHLC',
+            increasing_line_color='green',
+            decreasing_line_color='red'
+        ),
+        row=1, col=1
+    )
+    # Add volume bar chart
+    fig.add_trace(
+        go.Bar(
+            x=df.index,
+            y=df['Volume'],
+            name='Volume',
+            marker_color='lightblue',
+            opacity=0.7
+        ),
+        row=2, col=1
+    )
+    # Update layout
+    fig.update_layout(
+        title='Interactive Candlestick Chart with Volume',
+        yaxis_title='Price ($)',
+        xaxis_rangeslider_visible=False,
+        height=800,
+        showlegend=True
+    )
+    fig.update_yaxes(title_text="Price ($)", row=1, col=1)
+    fig.update_yaxes(title_text="Volume", row=2, col=1)
+    # Show the plot (comment out if causing issues)
+    # fig.show()
 
+    # Save as HTML file
+    fig.write_html("interactive_candlestick.html")
+    print("Chart saved to interactive_candlestick.html")
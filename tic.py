@@ -1,95 +1,485 @@
+import base64
+import json
+import multiprocessing as mp
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+from multiprocessing import shared_memory
+
 import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
+import plotly.io as pio
+
+# Streaming kernels: each factory returns a step function that is fed a
+# series in order, one chunk at a time, and keeps only the state needed to
+# continue (the current blocks, the previous value, the EWM carry). Work is
+# done in blocks aligned to the start of the series, so every output depends
+# on the data alone, not on where the chunks were cut: one call over a whole
+# series and many calls over its chunks give bit-identical results, in O(n).
+EWM_BLOCK = 64
+
+def _window_sums(prev, cur):
+    # Row r of cur is block b, row r of prev block b-1; the window ending at
+    # cur[r, j] is prev[r, j+1:] plus cur[r, :j+1]
+    suffix = np.cumsum(prev[:, ::-1], axis=1)[:, ::-1]
+    sums = np.cumsum(cur, axis=1)
+    sums[:, :-1] += suffix[:, 1:]
+    return sums
+
+def _window_mean(blocks):
+    return _window_sums(blocks[:-1], blocks[1:]) / blocks.shape[1]
 
-def create_trading_dashboard(symbol='AAPL', period='6mo'):
+def _window_std(blocks):
+    # Sums of squares around each block's first value, to limit cancellation
+    window = blocks.shape[1]
+    shift = np.nan_to_num(blocks[1:, :1], nan=0.0, posinf=0.0, neginf=0.0)
+    prev, cur = blocks[:-1] - shift, blocks[1:] - shift
+    total = _window_sums(prev, cur)
+    squares = _window_sums(prev * prev, cur * cur)
+    variance = (squares - total * total / window) / (window - 1)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+def _rolling(window, reduce):
     """
-    Create a complete trading dashboard with real data
+    The series is cut into blocks of `window` bars aligned to its start, so
+    each window is a suffix of one block plus a prefix of the next, both
+    cumulative sums within a block. State is the last full block and the
+    current partial one; it starts as an all-NaN block, which makes the first
+    window-1 outputs NaN.
     """
-    try:
-        # Download real data
-        stock = yf.Ticker(symbol)
-        df = stock.history(period=period)
+    state = np.full(window, np.nan)
+    
+    def step(values):
+        nonlocal state
+        x = np.concatenate([state, values])
+        full_blocks, rest = divmod(len(x), window)
+        padded = np.full((full_blocks + (rest > 0)) * window, np.nan)
+        padded[:len(x)] = x
         
-        if df.empty:
-            print(f"No data found for symbol {symbol}")
-            return None, None
-            
-        # Calculate technical indicators
-        df['MA20'] = df['Close'].rolling(window=20).mean()
-        df['MA50'] = df['Close'].rolling(window=50).mean()
-        df['MA200'] = df['Close'].rolling(window=200).mean()
+        out = reduce(padded.reshape(-1, window)).ravel()[len(state) - window:len(x) - window]
+        state = x[(full_blocks - 1) * window:].copy()
+        return out
+    
+    return step
+
+def rolling_mean(window):
+    return _rolling(window, _window_mean)
+
+def rolling_std(window):
+    return _rolling(window, _window_std)
+
+def diff():
+    last = np.array([np.nan])
+    
+    def step(values):
+        nonlocal last
+        x = np.concatenate([last, values])
+        last = x[-1:].copy()
+        return x[1:] - x[:-1]
+    
+    return step
+
+def _forward_fill():
+    last = np.array([np.nan])
+    
+    def step(values):
+        nonlocal last
+        x = np.concatenate([last, values])
+        positions = np.where(np.isnan(x), 0, np.arange(len(x)))
+        filled = x[np.maximum.accumulate(positions)]
+        last = filled[-1:].copy()
+        return filled[1:]
+    
+    return step
+
+def ewm_mean(span):
+    """
+    Equivalent of Series.ewm(span=span).mean() (adjust=True): the weighted
+    sum S and weight W are computed in blocks of up to EWM_BLOCK bars aligned
+    to the start of the series, each block from the carry of the previous one.
+    A trailing partial block is kept and recomputed on the next call.
+    """
+    if span < 1:
+        raise ValueError("span must be >= 1")
+    beta = 1 - 2 / (span + 1)
+    if beta == 0:
+        # Each observation has all the weight; gaps keep the last value
+        return _forward_fill()
+    
+    # Shorter blocks for fast decay, so beta ** -(size - 1) stays finite
+    size = int(min(EWM_BLOCK, 1 + np.log(1e100) / -np.log(beta)))
+    powers = np.arange(size)
+    inverse = beta ** -powers
+    forward = beta ** powers
+    carried = beta ** (powers + 1)
+    decay = float(carried[-1])
+    carry = (0.0, 0.0)
+    pending = np.empty(0)
+    
+    def step(values):
+        nonlocal carry, pending
+        x = np.concatenate([pending, values])
+        full_blocks, rest = divmod(len(x), size)
+        padded = np.full((full_blocks + (rest > 0)) * size, np.nan)
+        padded[:len(x)] = x
         
-        # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-        df['BB_Std'] = df['Close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (df['BB_Std'] * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (df['BB_Std'] * 2)
+        observed = ~np.isnan(padded)
+        blocks = {
+            'S': np.where(observed, padded, 0.0).reshape(-1, size),
+            'W': observed.astype(float).reshape(-1, size)
+        }
+        starts = {}
+        for key, block in blocks.items():
+            # In-block sums, then the carry from the previous block
+            block = np.cumsum(block * inverse, axis=1) * forward
+            start = []
+            state = carry[0] if key == 'S' else carry[1]
+            for end in block[:, -1].tolist():
+                start.append(state)
+                state = decay * state + end
+            start = np.array(start)
+            blocks[key] = carried * start[:, None] + block
+            starts[key] = state if rest == 0 else start[-1]
         
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        with np.errstate(invalid='ignore'):
+            out = (blocks['S'] / blocks['W']).ravel()[len(pending):len(x)]
+        carry = (starts['S'], starts['W'])
+        pending = x[full_blocks * size:].copy()
+        return out
+    
+    return step
+
+# Indicator registry: each node declares its inputs (price columns or other
+# nodes), the number of bars it needs before producing a value, its output
+# columns and a factory for the step function that computes them from the
+# resolved inputs. Step functions may be called once on the whole series or
+# repeatedly on consecutive chunks.
+def _moving_average(window):
+    def make():
+        mean = rolling_mean(window)
+        return lambda v: {f'MA{window}': mean(v['Close'])}
+    return make
+
+def _ema(span):
+    def make():
+        mean = ewm_mean(span)
+        return lambda v: {f'EMA{span}': mean(v['Close'])}
+    return make
+
+def _bollinger_std():
+    std = rolling_std(20)
+    return lambda v: {'BB_Std': std(v['Close'])}
+
+def _bollinger():
+    return lambda v: {
+        'BB_Middle': v['MA20'],
+        'BB_Std': v['BB_Std'],
+        'BB_Upper': v['MA20'] + (v['BB_Std'] * 2),
+        'BB_Lower': v['MA20'] - (v['BB_Std'] * 2)
+    }
+
+def _rsi():
+    delta_of = diff()
+    gain_mean = rolling_mean(14)
+    loss_mean = rolling_mean(14)
+    
+    def step(v):
+        delta = delta_of(v['Close'])
+        gain = gain_mean(np.where(delta > 0, delta, 0.0))
+        loss = loss_mean(-np.where(delta < 0, delta, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
+            return {'RSI': 100 - (100 / (1 + rs))}
+    
+    return step
+
+def _macd():
+    signal_mean = ewm_mean(9)
+    
+    def step(v):
+        macd = v['EMA12'] - v['EMA26']
+        signal = signal_mean(macd)
+        return {'MACD': macd, 'MACD_Signal': signal, 'MACD_Histogram': macd - signal}
+    
+    return step
+
+INDICATORS = {
+    'MA20': {'inputs': ['Close'], 'warmup': 20, 'outputs': ['MA20'], 'compute': _moving_average(20)},
+    'MA50': {'inputs': ['Close'], 'warmup': 50, 'outputs': ['MA50'], 'compute': _moving_average(50)},
+    'MA200': {'inputs': ['Close'], 'warmup': 200, 'outputs': ['MA200'], 'compute': _moving_average(200)},
+    'BB_Std': {'inputs': ['Close'], 'warmup': 20, 'outputs': ['BB_Std'], 'compute': _bollinger_std},
+    'BB': {
+        'inputs': ['MA20', 'BB_Std'], 'warmup': 20,
+        'outputs': ['BB_Middle', 'BB_Std', 'BB_Upper', 'BB_Lower'], 'compute': _bollinger
+    },
+    'RSI': {'inputs': ['Close'], 'warmup': 14, 'outputs': ['RSI'], 'compute': _rsi},
+    'EMA12': {'inputs': ['Close'], 'warmup': 12, 'outputs': ['EMA12'], 'compute': _ema(12)},
+    'EMA26': {'inputs': ['Close'], 'warmup': 26, 'outputs': ['EMA26'], 'compute': _ema(26)},
+    'MACD': {
+        'inputs': ['EMA12', 'EMA26'], 'warmup': 34,
+        'outputs': ['MACD', 'MACD_Signal', 'MACD_Histogram'], 'compute': _macd
+    }
+}
+
+DASHBOARD_INDICATORS = ('MA20', 'MA50', 'MA200', 'BB', 'RSI', 'MACD')
+
+def plan_indicators(names, columns, length=None):
+    """
+    Resolve the requested indicators against the registry.
+    Returns (order, computed, inputs): the nodes to compute in dependency
+    order, the requested indicators among them and the data columns they
+    read. With a length, nodes whose warm-up exceeds it (or that depend on
+    one) are skipped. Requested names must be registry indicators.
+    """
+    unknown = [name for name in names if name not in INDICATORS]
+    if unknown:
+        raise ValueError(f"Not indicators: {', '.join(map(str, unknown))} "
+                         f"(available: {', '.join(INDICATORS)})")
+    
+    order = []
+    inputs = []
+    skipped = set()
+    
+    def resolve(name):
+        if name in order or name in inputs:
+            return True
+        if name in skipped:
+            return False
         
-        # MACD
-        exp1 = df['Close'].ewm(span=12).mean()
-        exp2 = df['Close'].ewm(span=26).mean()
-        df['MACD'] = exp1 - exp2
-        df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-        df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
+        if name in INDICATORS:
+            spec = INDICATORS[name]
+            ready = all([resolve(dep) for dep in spec['inputs']])
+            if not ready or (length is not None and spec['warmup'] > length):
+                skipped.add(name)
+                return False
+            order.append(name)
+        elif name in columns:
+            inputs.append(name)
+        else:
+            raise KeyError(f"Unknown indicator or column: {name}")
         
-        # Create subplots
-        fig = make_subplots(
-            rows=4, cols=1,
-            shared_xaxes=True,
-            vertical_spacing=0.05,
-            subplot_titles=(
-                f'{symbol} - Price Chart',
-                'Volume',
-                'RSI',
-                'MACD'
-            ),
-            row_heights=[0.5, 0.15, 0.175, 0.175]
-        )
+        return True
+    
+    computed = [name for name in names if resolve(name)]
+    return order, computed, inputs
+
+def _run_steps(order, steps, values):
+    for name in order:
+        values.update(steps[name](values))
+    return values
+
+def compute_indicators(df, names):
+    """
+    Add the requested indicators' output columns to df, in place.
+    Shared inputs are computed once; indicators whose warm-up exceeds the
+    data length (or that depend on one) are skipped.
+    Returns the list of requested indicators that were computed.
+    """
+    order, computed, inputs = plan_indicators(names, df.columns, len(df))
+    steps = {name: INDICATORS[name]['compute']() for name in order}
+    
+    values = {column: df[column].to_numpy(dtype=float) for column in inputs}
+    _run_steps(order, steps, values)
+    
+    for name in computed:
+        for column in INDICATORS[name]['outputs']:
+            df[column] = values[column]
+    
+    return computed
+
+def compute_indicators_chunked(chunks, names, path):
+    """
+    Out-of-core compute_indicators: stream OHLCV DataFrame chunks (e.g. from
+    pd.read_csv(..., chunksize=n)), carrying rolling and EWM state across
+    chunk boundaries, and append the indicator columns to a CSV at path.
+    Only one chunk is held in memory at a time. The output is bit-identical
+    to compute_indicators on the whole series when read back with
+    pd.read_csv(path, index_col=0, float_precision='round_trip').
+    The total length is unknown up front, so warm-up skipping is not applied.
+    Returns the list of requested indicators that were computed.
+    """
+    computed = []
+    steps = None
+    
+    for chunk in chunks:
+        if steps is None:
+            order, computed, inputs = plan_indicators(names, chunk.columns)
+            steps = {name: INDICATORS[name]['compute']() for name in order}
+            outputs = [column for name in computed for column in INDICATORS[name]['outputs']]
+            header = True
+        
+        values = {column: chunk[column].to_numpy(dtype=float) for column in inputs}
+        _run_steps(order, steps, values)
+        
+        result = pd.DataFrame({column: values[column] for column in outputs}, index=chunk.index)
+        result.to_csv(path, mode='w' if header else 'a', header=header)
+        header = False
+    
+    return computed
+
+# Shared-memory universe: every column the indicators read or write is one
+# float64 block in multiprocessing.shared_memory, with the symbols laid out
+# back to back. Workers attach to the blocks by name and compute a
+# contiguous range of symbols in place, so no DataFrame is pickled in or out.
+def _attach(blocks, length):
+    handles = {column: shared_memory.SharedMemory(name=name) for column, name in blocks.items()}
+    arrays = {
+        column: np.ndarray((length,), dtype=np.float64, buffer=handle.buf)
+        for column, handle in handles.items()
+    }
+    return handles, arrays
+
+def _owning_array(handle, length):
+    # The array's base holds the SharedMemory, so the block stays mapped for
+    # as long as the array or any view of it is alive, then closes itself
+    view = np.ndarray((length,), dtype=np.float64, buffer=handle.buf)
+    owner = SimpleNamespace(__array_interface__=view.__array_interface__, view=view, handle=handle)
+    return np.asarray(owner)
+
+def _shared_worker(blocks, offsets, first, last, names, inputs):
+    handles, arrays = _attach(blocks, offsets[-1])
+    values = {}
+    try:
+        for i in range(first, last):
+            start, stop = offsets[i], offsets[i + 1]
+            order, computed, _ = plan_indicators(names, inputs, stop - start)
+            steps = {name: INDICATORS[name]['compute']() for name in order}
+            
+            values = {column: arrays[column][start:stop] for column in inputs}
+            _run_steps(order, steps, values)
+            
+            for name in computed:
+                for column in INDICATORS[name]['outputs']:
+                    arrays[column][start:stop] = values[column]
+    finally:
+        # Views must go before the buffers can be closed
+        del arrays, values
+        for handle in handles.values():
+            handle.close()
+
+@contextmanager
+def shared_indicators(universe, names, workers=None):
+    """
+    Compute indicators for a universe of symbols ({symbol: OHLCV DataFrame})
+    across worker processes sharing memory. Input columns are copied into
+    shared memory once; workers get symbol ranges balanced by bar count and
+    write into preallocated shared output arrays.
+    Yields {symbol: {column: array}}, the arrays being views on shared memory.
+    The segment names are unlinked when the with block exits; the memory
+    itself is unmapped once the last view is gone.
+    Indicators whose warm-up exceeds a symbol's history are left as NaN for
+    that symbol.
+    """
+    symbols = list(universe)
+    if not symbols:
+        yield {}
+        return
+    
+    lengths = [len(universe[symbol]) for symbol in symbols]
+    offsets = [0] + np.cumsum(lengths).tolist()
+    total = offsets[-1]
+    
+    order, computed, inputs = plan_indicators(names, universe[symbols[0]].columns)
+    outputs = list(dict.fromkeys(column for name in computed for column in INDICATORS[name]['outputs']))
+    
+    handles = {}
+    results = {}
+    try:
+        for column in inputs + outputs:
+            handles[column] = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8)
+        arrays = {column: _owning_array(handle, total) for column, handle in handles.items()}
+        for column in inputs:
+            for symbol, start, stop in zip(symbols, offsets, offsets[1:]):
+                arrays[column][start:stop] = universe[symbol][column].to_numpy(dtype=float)
+        for column in outputs:
+            arrays[column][:] = np.nan
+        
+        # Contiguous symbol ranges with roughly equal numbers of bars
+        workers = min(workers or os.cpu_count() or 1, len(symbols))
+        cuts = np.searchsorted(offsets, np.linspace(0, total, workers + 1)).tolist()
+        cuts[0], cuts[-1] = 0, len(symbols)
+        blocks = {column: handle.name for column, handle in handles.items()}
+        tasks = [
+            (blocks, offsets, first, last, names, inputs)
+            for first, last in zip(cuts, cuts[1:]) if first < last
+        ]
+        
+        if len(tasks) > 1:
+            with mp.Pool(len(tasks)) as pool:
+                pool.starmap(_shared_worker, tasks)
+        elif tasks:
+            _shared_worker(*tasks[0])
         
-        # Add candlestick (without hovertemplate)
+        for symbol, start, stop in zip(symbols, offsets, offsets[1:]):
+            results[symbol] = {column: arrays[column][start:stop] for column in outputs}
+        yield results
+    finally:
+        # Views handed out keep their block open; only the names go now
+        for handle in handles.values():
+            handle.unlink()
+
+def build_dashboard_figure(df, symbol='AAPL', indicators=DASHBOARD_INDICATORS):
+    """
+    Build the dashboard figure from OHLCV data, adding indicator columns to df.
+    Only the indicators listed in `indicators` are computed and drawn.
+    """
+    # Calculate only the indicators that will be drawn
+    computed = compute_indicators(df, indicators)
+    
+    # Create subplots: price, volume, then one panel per drawn oscillator
+    panels = ['Volume'] + [name for name in ('RSI', 'MACD') if name in computed]
+    panel_rows = {name: row for row, name in enumerate(panels, start=2)}
+    panel_heights = {'Volume': 0.15, 'RSI': 0.175, 'MACD': 0.175}
+    fig = make_subplots(
+        rows=len(panels) + 1, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        subplot_titles=(f'{symbol} - Price Chart', *panels),
+        row_heights=[0.5] + [panel_heights[name] for name in panels]
+    )
+    
+    # Add candlestick (without hovertemplate)
+    fig.add_trace(
+        go.Candlestick(
+            x=df.index,
+            open=df['Open'],
+            high=df['High'],
+            low=df['Low'],
+            close=df['Close'],
+            name='OHLC',
+            increasing_line_color='#26a69a',
+            decreasing_line_color='#ef5350',
+            increasing_fillcolor='rgba(38, 166, 154, 0.8)',
+            decreasing_fillcolor='rgba(239, 83, 80, 0.8)'
+        ),
+        row=1, col=1
+    )
+    
+    # Add moving averages
+    colors_ma = {'MA20': 'blue', 'MA50': 'red', 'MA200': 'purple'}
+    for ma, color in colors_ma.items():
+        if ma not in computed:
+            continue
         fig.add_trace(
-            go.Candlestick(
+            go.Scatter(
                 x=df.index,
-                open=df['Open'],
-                high=df['High'],
-                low=df['Low'],
-                close=df['Close'],
-                name='OHLC',
-                increasing_line_color='#26a69a',
-                decreasing_line_color='#ef5350',
-                increasing_fillcolor='rgba(38, 166, 154, 0.8)',
-                decreasing_fillcolor='rgba(239, 83, 80, 0.8)'
+                y=df[ma],
+                mode='lines',
+                name=ma,
+                line=dict(color=color, width=2),
+                opacity=0.8
             ),
             row=1, col=1
         )
-        
-        # Add moving averages
-        colors_ma = {'MA20': 'blue', 'MA50': 'red', 'MA200': 'purple'}
-        for ma, color in colors_ma.items():
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df[ma],
-                    mode='lines',
-                    name=ma,
-                    line=dict(color=color, width=2),
-                    opacity=0.8
-                ),
-                row=1, col=1
-            )
-        
-        # Add Bollinger Bands
+    
+    # Add Bollinger Bands
+    if 'BB' in computed:
         fig.add_trace(
             go.Scatter(
                 x=df.index,
@@ -101,7 +491,7 @@ def create_trading_dashboard(symbol='AAPL', period='6mo'):
             ),
             row=1, col=1
         )
-        
+    
         fig.add_trace(
             go.Scatter(
                 x=df.index,
@@ -115,22 +505,23 @@ def create_trading_dashboard(symbol='AAPL', period='6mo'):
             ),
             row=1, col=1
         )
-        
-        # Add volume
-        colors = ['#ef5350' if close < open else '#26a69a' 
-                 for close, open in zip(df['Close'], df['Open'])]
-        fig.add_trace(
-            go.Bar(
-                x=df.index,
-                y=df['Volume'],
-                name='Volume',
-                marker_color=colors,
-                opacity=0.7
-            ),
-            row=2, col=1
-        )
-        
-        # Add RSI
+    
+    # Add volume
+    colors = ['#ef5350' if close < open else '#26a69a' 
+             for close, open in zip(df['Close'], df['Open'])]
+    fig.add_trace(
+        go.Bar(
+            x=df.index,
+            y=df['Volume'],
+            name='Volume',
+            marker_color=colors,
+            opacity=0.7
+        ),
+        row=panel_rows['Volume'], col=1
+    )
+    
+    # Add RSI
+    if 'RSI' in computed:
         fig.add_trace(
             go.Scatter(
                 x=df.index,
@@ -139,15 +530,16 @@ def create_trading_dashboard(symbol='AAPL', period='6mo'):
                 name='RSI',
                 line=dict(color='orange', width=2)
             ),
-            row=3, col=1
+            row=panel_rows['RSI'], col=1
         )
-        
+    
         # Add RSI reference lines
-        fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5, row=3, col=1)
-        fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.5, row=3, col=1)
-        fig.add_hline(y=50, line_dash="dot", line_color="gray", opacity=0.3, row=3, col=1)
-        
-        # Add MACD
+        fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5, row=panel_rows['RSI'], col=1)
+        fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.5, row=panel_rows['RSI'], col=1)
+        fig.add_hline(y=50, line_dash="dot", line_color="gray", opacity=0.3, row=panel_rows['RSI'], col=1)
+    
+    # Add MACD
+    if 'MACD' in computed:
         fig.add_trace(
             go.Scatter(
                 x=df.index,
@@ -156,9 +548,9 @@ def create_trading_dashboard(symbol='AAPL', period='6mo'):
                 name='MACD',
                 line=dict(color='blue', width=2)
             ),
-            row=4, col=1
+            row=panel_rows['MACD'], col=1
         )
-        
+    
         fig.add_trace(
             go.Scatter(
                 x=df.index,
@@ -167,9 +559,9 @@ def create_trading_dashboard(symbol='AAPL', period='6mo'):
                 name='MACD Signal',
                 line=dict(color='red', width=2)
             ),
-            row=4, col=1
+            row=panel_rows['MACD'], col=1
         )
-        
+    
         # MACD Histogram
         colors_macd = ['#26a69a' if val >= 0 else '#ef5350' for val in df['MACD_Histogram']]
         fig.add_trace(
@@ -180,133 +572,144 @@ def create_trading_dashboard(symbol='AAPL', period='6mo'):
                 marker_color=colors_macd,
                 opacity=0.6
             ),
-            row=4, col=1
+            row=panel_rows['MACD'], col=1
         )
-        
+    
         # Add zero line for MACD
-        fig.add_hline(y=0, line_dash="solid", line_color="gray", opacity=0.5, row=4, col=1)
+        fig.add_hline(y=0, line_dash="solid", line_color="gray", opacity=0.5, row=panel_rows['MACD'], col=1)
+    
+    # Calculate key levels
+    current_price = df['Close'].iloc[-1]
+    high_52w = df['High'].rolling(window=min(252, len(df))).max().iloc[-1]
+    low_52w = df['Low'].rolling(window=min(252, len(df))).min().iloc[-1]
+    
+    # Add current price annotation
+    fig.add_annotation(
+        x=df.index[-1],
+        y=current_price,
+        text=f"${current_price:.2f}",
+        showarrow=True,
+        arrowhead=2,
+        arrowcolor="yellow",
+        arrowwidth=2,
+        bgcolor="rgba(255, 255, 0, 0.8)",
+        bordercolor="black",
+        borderwidth=1,
+        font=dict(color="black", size=12),
+        row=1, col=1
+    )
+    
+    # Add 52-week high/low lines
+    fig.add_hline(
+        y=high_52w,
+        line_dash="solid",
+        line_color="green",
+        line_width=2,
+        opacity=0.7,
+        annotation_text=f"52W High: ${high_52w:.2f}",
+        annotation_position="top right",
+        row=1, col=1
+    )
+    
+    fig.add_hline(
+        y=low_52w,
+        line_dash="solid",
+        line_color="red",
+        line_width=2,
+        opacity=0.7,
+        annotation_text=f"52W Low: ${low_52w:.2f}",
+        annotation_position="bottom right",
+        row=1, col=1
+    )
+    
+    # Update layout
+    fig.update_layout(
+        title={
+            'text': f'{symbol} - Interactive Trading Dashboard',
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 24, 'color': 'white'}
+        },
+        template='plotly_dark',
+        height=1000,
+        width=1600,
         
-        # Calculate key levels
-        current_price = df['Close'].iloc[-1]
-        high_52w = df['High'].rolling(window=min(252, len(df))).max().iloc[-1]
-        low_52w = df['Low'].rolling(window=min(252, len(df))).min().iloc[-1]
+        # Hover settings
+        hovermode='x unified',
         
-        # Add current price annotation
-        fig.add_annotation(
-            x=df.index[-1],
-            y=current_price,
-            text=f"${current_price:.2f}",
-            showarrow=True,
-            arrowhead=2,
-            arrowcolor="yellow",
-            arrowwidth=2,
-            bgcolor="rgba(255, 255, 0, 0.8)",
-            bordercolor="black",
-            borderwidth=1,
-            font=dict(color="black", size=12),
-            row=1, col=1
-        )
+        # Spike styling
+        xaxis_spikemode='across',
+        yaxis_spikemode='across',
+        xaxis_spikesnap='cursor',
+        yaxis_spikesnap='cursor',
+        xaxis_spikecolor='rgba(255, 255, 255, 0.8)',
+        yaxis_spikecolor='rgba(255, 255, 255, 0.8)',
+        xaxis_spikethickness=1,
+        yaxis_spikethickness=1,
         
-        # Add 52-week high/low lines
-        fig.add_hline(
-            y=high_52w,
-            line_dash="solid",
-            line_color="green",
-            line_width=2,
-            opacity=0.7,
-            annotation_text=f"52W High: ${high_52w:.2f}",
-            annotation_position="top right",
-            row=1, col=1
-        )
+        # Range selector
+        xaxis=dict(
+            rangeselector=dict(
+                buttons=list([
+                    dict(count=7, label="7d", step="day", stepmode="backward"),
+                    dict(count=30, label="1m", step="day", stepmode="backward"),
+                    dict(count=90, label="3m", step="day", stepmode="backward"),
+                    dict(count=180, label="6m", step="day", stepmode="backward"),
+                    dict(count=365, label="1y", step="day", stepmode="backward"),
+                    dict(step="all", label="All")
+                ]),
+                bgcolor="rgba(50, 50, 50, 0.8)",
+                activecolor="rgba(100, 100, 100, 0.8)",
+                font=dict(color="white")
+            ),
+            rangeslider=dict(visible=False),
+            type="date"
+        ),
         
-        fig.add_hline(
-            y=low_52w,
-            line_dash="solid",
-            line_color="red",
-            line_width=2,
-            opacity=0.7,
-            annotation_text=f"52W Low: ${low_52w:.2f}",
-            annotation_position="bottom right",
-            row=1, col=1
+        # Legend
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            bgcolor="rgba(0, 0, 0, 0.5)"
         )
+    )
+    
+    # Crosshair settings for all subplots
+    fig.update_xaxes(showspikes=True)
+    fig.update_yaxes(showspikes=True)
+    
+    # Update y-axis labels
+    fig.update_yaxes(title_text="Price ($)", row=1, col=1)
+    for name, row in panel_rows.items():
+        fig.update_yaxes(title_text=name, row=row, col=1)
+    if 'RSI' in panel_rows:
+        fig.update_yaxes(range=[0, 100], row=panel_rows['RSI'], col=1)
+    
+    # Update x-axis labels
+    last_row = len(panels) + 1
+    for row in range(1, last_row):
+        fig.update_xaxes(showticklabels=False, row=row, col=1)
+    fig.update_xaxes(title_text="Date", row=last_row, col=1)
+    
+    return fig
+
+def create_trading_dashboard(symbol='AAPL', period='6mo', indicators=DASHBOARD_INDICATORS):
+    """
+    Create a complete trading dashboard with real data
+    """
+    try:
+        # Download real data
+        stock = yf.Ticker(symbol)
+        df = stock.history(period=period)
         
-        # Update layout
-        fig.update_layout(
-            title={
-                'text': f'{symbol} - Interactive Trading Dashboard',
-                'x': 0.5,
-                'xanchor': 'center',
-                'font': {'size': 24, 'color': 'white'}
-            },
-            template='plotly_dark',
-            height=1000,
-            width=1600,
-            
-            # Hover settings
-            hovermode='x unified',
-            
-            # Crosshair settings for all subplots
-            xaxis_showspikes=True,
-            yaxis_showspikes=True,
-            xaxis2_showspikes=True,
-            yaxis2_showspikes=True,
-            xaxis3_showspikes=True,
-            yaxis3_showspikes=True,
-            xaxis4_showspikes=True,
-            yaxis4_showspikes=True,
-            
-            # Spike styling
-            xaxis_spikemode='across',
-            yaxis_spikemode='across',
-            xaxis_spikesnap='cursor',
-            yaxis_spikesnap='cursor',
-            xaxis_spikecolor='rgba(255, 255, 255, 0.8)',
-            yaxis_spikecolor='rgba(255, 255, 255, 0.8)',
-            xaxis_spikethickness=1,
-            yaxis_spikethickness=1,
-            
-            # Range selector
-            xaxis=dict(
-                rangeselector=dict(
-                    buttons=list([
-                        dict(count=7, label="7d", step="day", stepmode="backward"),
-                        dict(count=30, label="1m", step="day", stepmode="backward"),
-                        dict(count=90, label="3m", step="day", stepmode="backward"),
-                        dict(count=180, label="6m", step="day", stepmode="backward"),
-                        dict(count=365, label="1y", step="day", stepmode="backward"),
-                        dict(step="all", label="All")
-                    ]),
-                    bgcolor="rgba(50, 50, 50, 0.8)",
-                    activecolor="rgba(100, 100, 100, 0.8)",
-                    font=dict(color="white")
-                ),
-                rangeslider=dict(visible=False),
-                type="date"
-            ),
+        if df.empty:
+            print(f"No data found for symbol {symbol}")
+            return None, None
             
-            # Legend
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                bgcolor="rgba(0, 0, 0, 0.5)"
-            )
-        )
-        
-        # Update y-axis labels
-        fig.update_yaxes(title_text="Price ($)", row=1, col=1)
-        fig.update_yaxes(title_text="Volume", row=2, col=1)
-        fig.update_yaxes(title_text="RSI", row=3, col=1, range=[0, 100])
-        fig.update_yaxes(title_text="MACD", row=4, col=1)
-        
-        # Update x-axis labels
-        fig.update_xaxes(showticklabels=False, row=1, col=1)
-        fig.update_xaxes(showticklabels=False, row=2, col=1)
-        fig.update_xaxes(showticklabels=False, row=3, col=1)
-        fig.update_xaxes(title_text="Date", row=4, col=1)
-        
+        fig = build_dashboard_figure(df, symbol, indicators)
         return fig, df
         
     except Exception as e:
@@ -328,8 +731,7 @@ def create_simple_interactive_chart(symbol='AAPL', period='6mo'):
             return None
         
         # Calculate simple indicators
-        df['MA20'] = df['Close'].rolling(window=20).mean()
-        df['MA50'] = df['Close'].rolling(window=50).mean()
+        computed = compute_indicators(df, ['MA20', 'MA50'])
         
         # Create figure
         fig = go.Figure()
@@ -349,23 +751,17 @@ def create_simple_interactive_chart(symbol='AAPL', period='6mo'):
         ))
         
         # Add moving averages
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['MA20'],
-            mode='lines',
-            name='MA20',
-            line=dict(color='blue', width=2),
-            opacity=0.8
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df['MA50'],
-            mode='lines',
-            name='MA50',
-            line=dict(color='red', width=2),
-            opacity=0.8
-        ))
+        for ma, color in {'MA20': 'blue', 'MA50': 'red'}.items():
+            if ma not in computed:
+                continue
+            fig.add_trace(go.Scatter(
+                x=df.index,
+                y=df[ma],
+                mode='lines',
+                name=ma,
+                line=dict(color=color, width=2),
+                opacity=0.8
+            ))
         
         # Update layout with interactive features
         fig.update_layout(
@@ -427,90 +823,251 @@ def create_simple_interactive_chart(symbol='AAPL', period='6mo'):
         print(f"Error creating simple chart: {e}")
         return None
 
-# Test both versions
-print("Creating interactive trading charts...")
-
-# Test simple version first
-symbols = ['AAPL', 'GOOGL', 'MSFT', 'TSLA']
-
-for symbol in symbols:
-    print(f"\nCreating simple chart for {symbol}...")
-    
-    # Try simple version first
-    fig_simple = create_simple_interactive_chart(symbol, '1y')
-    
-    if fig_simple is not None:
-        # Show the chart
-        fig_simple.show(config={
-            'displayModeBar': True,
-            'displaylogo': False,
-            'modeBarButtonsToAdd': [
-                'drawline',
-                'drawopenpath',
-                'drawclosedpath',
-                'drawcircle',
-                'drawrect',
-                'eraseshape'
-            ],
-            'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
-            'toImageButtonOptions': {
-                'format': 'png',
-                'filename': f'{symbol}_simple_chart',
-                'height': 700,
-                'width': 1400,
-                'scale': 2
-            }
-        })
+# Binary export: dates as epoch ms and per-bar colors as palette indices, all
+# as plotly typed arrays. plotly >= 6 already encodes plain numeric arrays in
+# to_dict(), so on those versions only the dates and colors change here.
+TYPED_ARRAY_KEYS = ('x', 'y', 'open', 'high', 'low', 'close')
+MAX_PALETTE = 256
+
+def _typed_array_spec(arr, dtype):
+    data = np.ascontiguousarray(arr, dtype=np.dtype(dtype).newbyteorder('<'))
+    return {'dtype': dtype, 'bdata': base64.b64encode(data.tobytes()).decode('ascii')}
+
+def encode_typed_array(values):
+    """
+    Encode an array as a plotly typed-array spec ({'dtype', 'bdata'}).
+    Returns (spec, is_date); dates become float64 epoch milliseconds.
+    """
+    if isinstance(values, dict) and 'bdata' in values:
+        return values, False
+    
+    arr = np.asarray(values)
+    is_date = arr.dtype.kind == 'M' or (
+        arr.dtype == object and pd.api.types.infer_dtype(arr, skipna=True).startswith('datetime')
+    )
+    if is_date:
+        dates = pd.DatetimeIndex(arr)
+        if dates.tz is not None:
+            # Keep exchange wall-clock time, plotly.js has no notion of time zones
+            dates = dates.tz_localize(None)
+        arr = ((dates - pd.Timestamp(0)) / pd.Timedelta(milliseconds=1)).to_numpy()
+    elif arr.dtype.kind not in 'biuf':
+        return values, False
+    
+    return _typed_array_spec(arr, 'f8'), is_date
+
+def encode_color_array(colors):
+    """
+    Encode per-point color strings as uint8 palette indices and a stepped
+    colorscale. Returns the marker properties replacing 'color', or None
+    when colors is not a list of at most MAX_PALETTE distinct strings.
+    """
+    if isinstance(colors, str) or not isinstance(colors, (list, tuple, np.ndarray)):
+        return None
+    if not all(isinstance(color, str) for color in colors):
+        return None
+    
+    palette, index = np.unique(np.asarray(colors, dtype=str), return_inverse=True)
+    if len(palette) > MAX_PALETTE:
+        return None
+    
+    # Index i sits exactly on stop i, so no color is ever interpolated
+    top = max(len(palette) - 1, 1)
+    colorscale = [[i / top, str(color)] for i, color in enumerate(palette)]
+    if len(palette) == 1:
+        colorscale.append([1, str(palette[0])])
+    
+    return {
+        'color': _typed_array_spec(index, 'u1'),
+        'colorscale': colorscale,
+        'cmin': 0,
+        'cmax': top
+    }
+
+def to_binary_figure_dict(fig):
+    """
+    Convert a figure to a dict whose trace arrays and per-point marker
+    colors are base64 typed arrays
+    """
+    fig_dict = fig.to_dict()
+    date_axes = set()
+    
+    for trace in fig_dict['data']:
+        for key in TYPED_ARRAY_KEYS:
+            if key not in trace or trace[key] is None:
+                continue
+            trace[key], is_date = encode_typed_array(trace[key])
+            if is_date and key == 'x':
+                date_axes.add(trace.get('xaxis', 'x'))
+        
+        marker = trace.get('marker')
+        if marker and 'color' in marker:
+            encoded = encode_color_array(marker['color'])
+            if encoded is not None:
+                marker.update(encoded)
+    
+    # Epoch numbers would otherwise be auto-typed as a linear axis
+    for axis in date_axes:
+        layout_key = 'xaxis' + axis[1:]
+        fig_dict['layout'].setdefault(layout_key, {})['type'] = 'date'
+    
+    return fig_dict
+
+def write_html_binary(fig, filename, **kwargs):
+    """
+    Write a figure to HTML with typed-array trace data. An x array shared by
+    several traces (the date index) is written once as a JS variable.
+    Requires the plotly.js bundled with plotly >= 5.19 (typed-array support).
+    """
+    fig_dict = to_binary_figure_dict(fig)
+    
+    shared = {}
+    for trace in fig_dict['data']:
+        spec = trace.get('x')
+        if isinstance(spec, dict) and 'bdata' in spec:
+            shared.setdefault((spec['dtype'], spec['bdata']), []).append(trace)
+    
+    declarations = []
+    for (dtype, bdata), traces in shared.items():
+        if len(traces) < 2:
+            continue
+        name = f'sharedX{len(declarations)}'
+        placeholder = f'__{name}_{uuid.uuid4().hex}__'
+        for trace in traces:
+            trace['x'] = placeholder
+        declarations.append((name, placeholder, json.dumps({'dtype': dtype, 'bdata': bdata})))
+    
+    html = pio.to_html(fig_dict, validate=False, **kwargs)
+    for name, placeholder, spec in declarations:
+        html = html.replace(f'"{placeholder}"', name)
+    if declarations:
+        anchor = 'window.PLOTLYENV='
+        if anchor not in html:
+            raise RuntimeError("Unexpected plotly HTML template, cannot share x arrays")
+        script = ''.join(f'var {name} = {spec}; ' for name, _, spec in declarations)
+        html = html.replace(anchor, script + anchor, 1)
+    
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+def compare_html_exports(fig, basename):
+    """
+    Write a figure with both the JSON and the binary path and report size/time
+    """
+    results = {}
+    exports = {
+        'json': (fig.write_html, f"{basename}.html"),
+        'binary': (lambda name: write_html_binary(fig, name), f"{basename}_binary.html"),
+    }
+    
+    for label, (write, filename) in exports.items():
+        start = time.perf_counter()
+        write(filename)
+        elapsed = time.perf_counter() - start
+        results[label] = {
+            'file': filename,
+            'bytes': os.path.getsize(filename),
+            'seconds': elapsed
+        }
+    
+    json_res, bin_res = results['json'], results['binary']
+    print(f"  HTML export (JSON):   {json_res['bytes'] / 1024:,.1f} KiB in {json_res['seconds']:.3f}s")
+    print(f"  HTML export (binary): {bin_res['bytes'] / 1024:,.1f} KiB in {bin_res['seconds']:.3f}s")
+    print(f"  Size ratio: {bin_res['bytes'] / json_res['bytes']:.2f}x, "
+          f"time ratio: {bin_res['seconds'] / json_res['seconds']:.2f}x")
+    
+    return results
+
+def main():
+    """
+    Build and save the simple chart and the advanced dashboard for each symbol
+    """
+    # Test both versions
+    print("Creating interactive trading charts...")
+
+    # Test simple version first
+    symbols = ['AAPL', 'GOOGL', 'MSFT', 'TSLA']
+
+    for symbol in symbols:
+        print(f"\nCreating simple chart for {symbol}...")
         
-        # Save as HTML
-        fig_simple.write_html(f"{symbol}_simple_interactive.html")
-        print(f"✓ Simple chart for {symbol} created successfully")
-    
-    # Try advanced dashboard
-    print(f"Creating advanced dashboard for {symbol}...")
-    fig_advanced, df = create_trading_dashboard(symbol, '1y')
-    
-    if fig_advanced is not None and df is not None:
-        # Show the advanced chart
-        fig_advanced.show(config={
-            'displayModeBar': True,
-            'displaylogo': False,
-            'modeBarButtonsToAdd': [
-                'drawline',
-                'drawopenpath',
-                'drawclosedpath',
-                'drawcircle',
-                'drawrect',
-                'eraseshape'
-            ],
-            'toImageButtonOptions': {
-                'format': 'png',
-                'filename': f'{symbol}_advanced_dashboard',
-                'height': 1000,
-                'width': 1600,
-                'scale': 2
-            }
-        })
+        # Try simple version first
+        fig_simple = create_simple_interactive_chart(symbol, '1y')
         
-        # Save as HTML
-        fig_advanced.write_html(f"{symbol}_advanced_dashboard.html")
+        if fig_simple is not None:
+            # Show the chart
+            fig_simple.show(config={
+                'displayModeBar': True,
+                'displaylogo': False,
+                'modeBarButtonsToAdd': [
+                    'drawline',
+                    'drawopenpath',
+                    'drawclosedpath',
+                    'drawcircle',
+                    'drawrect',
+                    'eraseshape'
+                ],
+                'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
+                'toImageButtonOptions': {
+                    'format': 'png',
+                    'filename': f'{symbol}_simple_chart',
+                    'height': 700,
+                    'width': 1400,
+                    'scale': 2
+                }
+            })
+            
+            # Save as HTML
+            fig_simple.write_html(f"{symbol}_simple_interactive.html")
+            print(f"✓ Simple chart for {symbol} created successfully")
         
-        # Print summary statistics
-        current_price = df['Close'].iloc[-1]
-        price_change = df['Close'].iloc[-1] - df['Close'].iloc[-2]
-        price_change_pct = (price_change / df['Close'].iloc[-2]) * 100
+        # Try advanced dashboard
+        print(f"Creating advanced dashboard for {symbol}...")
+        fig_advanced, df = create_trading_dashboard(symbol, '1y')
         
-        print(f"✓ Advanced dashboard for {symbol} created successfully")
-        print(f"  Current Price: ${current_price:.2f}")
-        print(f"  Daily Change: ${price_change:.2f} ({price_change_pct:+.2f}%)")
-        print(f"  52W High: ${df['High'].rolling(min(252, len(df))).max().iloc[-1]:.2f}")
-        print(f"  52W Low: ${df['Low'].rolling(min(252, len(df))).min().iloc[-1]:.2f}")
-        if not df['RSI'].isna().iloc[-1]:
-            print(f"  Current RSI: {df['RSI'].iloc[-1]:.2f}")
-    else:
-        print(f"✗ Failed to create advanced dashboard for {symbol}")
-    
-    print("-" * 60)
+        if fig_advanced is not None and df is not None:
+            # Show the advanced chart
+            fig_advanced.show(config={
+                'displayModeBar': True,
+                'displaylogo': False,
+                'modeBarButtonsToAdd': [
+                    'drawline',
+                    'drawopenpath',
+                    'drawclosedpath',
+                    'drawcircle',
+                    'drawrect',
+                    'eraseshape'
+                ],
+                'toImageButtonOptions': {
+                    'format': 'png',
+                    'filename': f'{symbol}_advanced_dashboard',
+                    'height': 1000,
+                    'width': 1600,
+                    'scale': 2
+                }
+            })
+            
+            # Save as HTML (typed-array version)
+            write_html_binary(fig_advanced, f"{symbol}_advanced_dashboard.html")
+            
+            # Print summary statistics
+            current_price = df['Close'].iloc[-1]
+            price_change = df['Close'].iloc[-1] - df['Close'].iloc[-2]
+            price_change_pct = (price_change / df['Close'].iloc[-2]) * 100
+            
+            print(f"✓ Advanced dashboard for {symbol} created successfully")
+            print(f"  Current Price: ${current_price:.2f}")
+            print(f"  Daily Change: ${price_change:.2f} ({price_change_pct:+.2f}%)")
+            print(f"  52W High: ${df['High'].rolling(min(252, len(df))).max().iloc[-1]:.2f}")
+            print(f"  52W Low: ${df['Low'].rolling(min(252, len(df))).min().iloc[-1]:.2f}")
+            if 'RSI' in df and not df['RSI'].isna().iloc[-1]:
+                print(f"  Current RSI: {df['RSI'].iloc[-1]:.2f}")
+        else:
+            print(f"✗ Failed to create advanced dashboard for {symbol}")
+        
+        print("-" * 60)
 
-print("\n🎉 Interactive trading charts created successfully!")
+    print("\n🎉 Interactive trading charts created successfully!")
 
+if __name__ == "__main__":
+    main()